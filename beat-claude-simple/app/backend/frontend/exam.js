@@ -0,0 +1,232 @@
+// Candidate exam page. The server renders the HTML shell and sets window.EXAM_CONFIG.
+const {slug: SLUG, questions: QUESTIONS, duration: DURATION_MIN} = window.EXAM_CONFIG;
+const DURATION_S = DURATION_MIN * 60;
+const LETTERS = ['A','B','C','D','E','F'];
+// Zero-padded "00".."59" (and every whole minute of the exam) so timer ticks don't build strings
+const PAD = Array.from({length: Math.max(60, DURATION_MIN + 1)}, (_, i) => String(i).padStart(2, '0'));
+
+let answers = Object.create(null);   // question id -> answer; no prototype, so ids never hit inherited keys
+let currentQ = 0;
+let tabViolations = 0;
+let timerTimeout = null;
+let textSaveTimer = null, textSaveIdx = null;
+let deadline = 0, secondsLeft = -1, timerWarned = false;
+let candidateName = '', candidateEmail = '', candidatePhone = '';
+
+// Elements the exam touches on every question view and timer tick, looked up once.
+// The script runs at the end of <body>, so they all exist already; navBtns is filled by buildNav().
+const DOM = { navBtns: [] };
+for (const id of ['timer', 'progressLabel', 'progressPct', 'progressFill', 'qNav', 'questionCard',
+                  'prevBtn', 'nextBtn', 'overlay', 'resultScore', 'tabWarn', 'violationCount']) {
+  DOM[id] = document.getElementById(id);
+}
+
+// ── Info Form ──
+document.getElementById('infoForm').addEventListener('submit', e => {
+  e.preventDefault();
+  candidateName  = document.getElementById('cName').value.trim();
+  candidateEmail = document.getElementById('cEmail').value.trim();
+  candidatePhone = document.getElementById('cPhone').value.trim();
+  startExam();
+});
+
+function startExam() {
+  showStep('step-exam');
+  buildNav();
+  renderQuestion(0);
+  startTimer();
+  document.addEventListener('visibilitychange', handleVisibility);
+  window.addEventListener('pagehide', submitOnLeave);
+  document.addEventListener('contextmenu', e => e.preventDefault());
+  document.addEventListener('copy', e => e.preventDefault());
+  document.addEventListener('paste', e => e.preventDefault());
+}
+
+function startTimer() {
+  deadline = performance.now() + DURATION_S * 1000;
+  tick();
+}
+
+// Time left is read from the monotonic clock, so late or throttled ticks (background tabs) never
+// stretch the exam and system clock changes can't shorten or extend it; each tick is scheduled
+// for the next whole-second boundary.
+function tick() {
+  const msLeft = deadline - performance.now();
+  const left = Math.max(0, Math.ceil(msLeft / 1000));
+  if (left !== secondsLeft) {
+    secondsLeft = left;
+    const m = Math.floor(secondsLeft / 60), s = secondsLeft % 60;
+    const timer = DOM.timer;
+    timer.textContent = PAD[m] + ':' + PAD[s];
+    if (secondsLeft <= 300 && !timerWarned) { timerWarned = true; timer.classList.add('warn'); }
+  }
+  if (secondsLeft <= 0) { submitExam('Time up!'); return; }
+  timerTimeout = setTimeout(tick, msLeft % 1000 || 1000);
+}
+
+// Buttons start in their default state; renderQuestion(0) marks the first one current
+function buildNav() {
+  const frag = document.createDocumentFragment();
+  QUESTIONS.forEach((_, i) => {
+    const b = el('button', 'q-nav-btn', i + 1);
+    b.id = 'nb' + i;
+    b.onclick = () => jumpTo(i);
+    frag.appendChild(b);
+    DOM.navBtns.push(b);
+  });
+  DOM.qNav.replaceChildren(frag);
+}
+
+function renderQuestion(idx) {
+  flushText();
+  const q = QUESTIONS[idx];
+  const total = QUESTIONS.length;
+  DOM.progressLabel.textContent = `Question ${idx+1} of ${total}`;
+  const pct = Math.round(idx / total * 100);
+  DOM.progressPct.textContent = pct + '%';
+  DOM.progressFill.style.width = pct + '%';
+
+  DOM.navBtns[currentQ].classList.remove('current');
+  DOM.navBtns[idx].classList.add('current');
+
+  // Built as nodes with textContent: no HTML parsing, and question text can't inject markup
+  const isMCQ = q.type === 'MCQ';
+  const card = document.createDocumentFragment();
+  const meta = el('div', 'q-meta');
+  meta.appendChild(el('span', isMCQ ? 'q-badge mcq' : 'q-badge open', isMCQ ? 'MCQ' : 'Open'));
+  if (q.skill) meta.appendChild(el('span', 'q-skill', q.skill));
+  card.append(meta, el('div', 'q-text', q.question));
+  if (isMCQ) {
+    const opts = el('div', 'options');
+    q.options.forEach((opt, i) => {
+      const o = el('div', 'option' + (answers[q.id]===LETTERS[i]?' selected':''));
+      o.onclick = () => selectMCQ(q.id, LETTERS[i], o);
+      o.append(el('div', 'opt-letter', LETTERS[i]), el('div', 'opt-text', opt));
+      opts.appendChild(o);
+    });
+    card.appendChild(opts);
+  } else {
+    const ta = el('textarea', 'text-answer');
+    ta.id = 'ta_' + q.id;
+    ta.placeholder = 'Type your answer here…';
+    ta.value = answers[q.id] || '';
+    ta.oninput = () => saveText(idx);
+    card.appendChild(ta);
+  }
+
+  const isLast = idx === QUESTIONS.length - 1;
+  DOM.questionCard.replaceChildren(card);
+  DOM.prevBtn.disabled = idx === 0;
+  DOM.nextBtn.textContent = isLast ? '📤 Submit Exam' : 'Next →';
+  DOM.nextBtn.className = 'btn ' + (isLast ? 'btn-submit' : 'btn-primary');
+  DOM.nextBtn.onclick = isLast ? confirmSubmit : () => navigate(1);
+  currentQ = idx;
+}
+
+function selectMCQ(qid, letter, opt) {
+  answers[qid] = letter;
+  opt.closest('.options').querySelectorAll('.option').forEach(o => o.classList.remove('selected'));
+  opt.classList.add('selected');
+  markAnswered(currentQ);
+}
+
+// Typing only re-arms a short timer; the answer and nav are updated once the candidate pauses
+function saveText(idx) {
+  clearTimeout(textSaveTimer);
+  textSaveIdx = idx;
+  textSaveTimer = setTimeout(flushText, 150);
+}
+
+function flushText() {
+  if (textSaveIdx === null) return;
+  clearTimeout(textSaveTimer);
+  const idx = textSaveIdx, qid = QUESTIONS[idx].id;
+  textSaveIdx = null;
+  const val = document.getElementById('ta_' + qid)?.value || '';
+  if (val.trim()) answers[qid] = val;
+  else delete answers[qid];
+  markAnswered(idx);
+}
+
+// Only the button whose answer changed is touched; the current marker is moved in renderQuestion
+function markAnswered(idx) {
+  DOM.navBtns[idx].classList.toggle('answered', answers[QUESTIONS[idx].id] !== undefined);
+}
+
+function navigate(dir) {
+  const next = currentQ + dir;
+  if (next >= 0 && next < QUESTIONS.length) renderQuestion(next);
+}
+function jumpTo(idx) { renderQuestion(idx); }
+
+function confirmSubmit() {
+  flushText();
+  const answered = Object.keys(answers).length;
+  const total = QUESTIONS.length;
+  if (answered < total && !confirm(`You've answered ${answered} of ${total} questions. Submit anyway?`)) return;
+  submitExam('Submitted by candidate');
+}
+
+async function submitExam(reason) {
+  flushText();
+  clearTimeout(timerTimeout);
+  DOM.overlay.classList.remove('hidden');
+  document.removeEventListener('visibilitychange', handleVisibility);
+
+  try {
+    const res = await fetch(`/exam/${SLUG}/submit`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(buildPayload()),
+    });
+    const data = await res.json();
+    window.removeEventListener('pagehide', submitOnLeave);
+    DOM.overlay.classList.add('hidden');
+    DOM.resultScore.textContent = data.mcq_score !== 'N/A' ? 'MCQ: ' + data.mcq_score : '✓';
+    showStep('step-result');
+  } catch (e) {
+    DOM.overlay.classList.add('hidden');
+    alert('Submission failed. Please check your connection and try again.');
+  }
+}
+
+function buildPayload() {
+  return {
+    name: candidateName, email: candidateEmail, phone: candidatePhone,
+    answers: answers, tab_violations: tabViolations,
+  };
+}
+
+// Closing or leaving the tab mid-exam still submits: unlike fetch, a beacon outlives the page
+function submitOnLeave() {
+  flushText();
+  const body = new Blob([JSON.stringify(buildPayload())], { type: 'application/json' });
+  navigator.sendBeacon(`/exam/${SLUG}/submit`, body);
+}
+
+function handleVisibility() {
+  if (document.hidden) {
+    tabViolations++;
+    const warn = DOM.tabWarn;
+    DOM.violationCount.textContent = `(${tabViolations}/3)`;
+    warn.classList.add('show');
+    setTimeout(() => warn.classList.remove('show'), 3500);
+    if (tabViolations >= 3) {
+      warn.textContent = '🚫 Too many tab switches — auto-submitting.';
+      warn.classList.add('show');
+      setTimeout(() => submitExam('Auto-submit: tab violations'), 1200);
+    }
+  }
+}
+
+function showStep(id) {
+  document.querySelectorAll('.step').forEach(s => s.classList.remove('active'));
+  document.getElementById(id).classList.add('active');
+}
+
+function el(tag, className, text) {
+  const node = document.createElement(tag);
+  if (className) node.className = className;
+  if (text !== undefined) node.textContent = text;
+  return node;
+}
@@ -5,20 +5,28 @@ Serves both recruiter dashboard and candidate exam pages.
 """
 import os
 import re
-import json
+import html
+import gzip
+import asyncio
 import secrets
 import hashlib
+import queue
 import sqlite3
 import httpx
+import orjson
+import brotli
 import bcrypt
 import jwt
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from typing import Optional
-from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -27,99 +35,241 @@ load_dotenv()
 # ─── Configuration ────────────────────────────────────────────────────────────
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 GROQ_MODEL   = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+GROQ_CONCURRENCY = int(os.getenv("GROQ_CONCURRENCY", "4"))   # parallel scoring calls per candidate
+SCORING_WORKERS  = int(os.getenv("SCORING_WORKERS", "2"))    # candidates scored at the same time
+SCORING_DRAIN_S  = int(os.getenv("SCORING_DRAIN_S", "30"))   # shutdown waits this long for queued scoring
 JWT_SECRET   = os.getenv("JWT_SECRET", secrets.token_hex(32))
 JWT_EXPIRY_H = 24
+BCRYPT_ROUNDS = 10   # library default is 12 (4x slower); existing hashes keep verifying at their own cost
 DB_PATH      = os.getenv("DB_PATH", "beat_claude.db")
 APP_URL      = os.getenv("APP_URL", "http://localhost:8000")   # public URL for exam links
+DB_POOL_SIZE = 8
+JD_CACHE_TTL_H = int(os.getenv("JD_CACHE_TTL_H", "24"))   # reuse generated questions for a repeated JD
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
 
 # ─── Database ─────────────────────────────────────────────────────────────────
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
+def _open_db() -> sqlite3.Connection:
+    # Autocommit mode: single statements commit on their own, and multi-statement
+    # writes open an explicit BEGIN IMMEDIATE so the write lock is taken up front
+    conn = sqlite3.connect(DB_PATH, isolation_level=None, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    # Per-connection tuning; journal_mode=WAL is persisted in the file by init_db()
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")      # 64 MB page cache
+    conn.execute("PRAGMA mmap_size = 268435456")    # 256 MB
+    conn.execute("PRAGMA busy_timeout = 30000")
     return conn
 
 
-def init_db():
-    conn = get_db()
-    c = conn.cursor()
-
-    c.execute("""CREATE TABLE IF NOT EXISTS users (
-        id           INTEGER PRIMARY KEY AUTOINCREMENT,
-        email        TEXT UNIQUE NOT NULL,
-        password_hash TEXT NOT NULL,
-        created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )""")
-
-    c.execute("""CREATE TABLE IF NOT EXISTS exams (
-        id               INTEGER PRIMARY KEY AUTOINCREMENT,
-        slug             TEXT UNIQUE NOT NULL,
-        title            TEXT NOT NULL,
-        role_title       TEXT DEFAULT '',
-        questions_json   TEXT NOT NULL,
-        duration_minutes INTEGER DEFAULT 60,
-        num_questions    INTEGER DEFAULT 10,
-        recruiter_email  TEXT NOT NULL,
-        created_at       TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )""")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_exams_slug    ON exams(slug)")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_exams_email   ON exams(recruiter_email)")
-
-    c.execute("""CREATE TABLE IF NOT EXISTS candidates (
-        id             INTEGER PRIMARY KEY AUTOINCREMENT,
-        exam_slug      TEXT NOT NULL,
-        name           TEXT NOT NULL,
-        email          TEXT NOT NULL,
-        phone          TEXT DEFAULT '',
-        started_at     TIMESTAMP,
-        submitted_at   TIMESTAMP,
-        tab_violations INTEGER DEFAULT 0,
-        created_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (exam_slug) REFERENCES exams(slug),
-        UNIQUE(exam_slug, email)
-    )""")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_cands_slug ON candidates(exam_slug)")
-
-    c.execute("""CREATE TABLE IF NOT EXISTS answers (
-        id           INTEGER PRIMARY KEY AUTOINCREMENT,
-        candidate_id INTEGER NOT NULL,
-        question_id  INTEGER NOT NULL,
-        selected_opt TEXT DEFAULT '',
-        is_correct   INTEGER DEFAULT 0,
-        ai_score     REAL DEFAULT -1,
-        ai_feedback  TEXT DEFAULT '',
-        created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (candidate_id) REFERENCES candidates(id) ON DELETE CASCADE
-    )""")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_answers_cand ON answers(candidate_id)")
-
-    conn.commit()
+# Idle connections are kept open so their page cache survives between requests.
+# LIFO: DB work never spans an await, so usually one connection is out at a time and the
+# most recently used (warmest) one is handed out again rather than rotating through all of them.
+_db_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+
+@contextmanager
+def db_conn():
+    """Borrow a pooled connection; it is returned to the pool on exit.
+    Never hold one across an `await` — other requests need the slot."""
+    try:
+        conn = _db_pool.get_nowait()
+    except queue.Empty:
+        conn = _open_db()
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        try:
+            _db_pool.put_nowait(conn)
+        except queue.Full:
+            _close_db(conn)
+
+
+def _close_db(conn: sqlite3.Connection):
+    # Refresh planner statistics for tables whose indexes this connection used
+    conn.execute("PRAGMA optimize")
     conn.close()
+
+
+def prime_db_pool():
+    """Open the connection the first requests will reuse, so they don't pay for it."""
+    if _db_pool.empty():
+        _db_pool.put_nowait(_open_db())
+
+
+def close_db_pool():
+    while True:
+        try:
+            _close_db(_db_pool.get_nowait())
+        except queue.Empty:
+            return
+
+
+SCHEMA_SQL = """
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS users (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    email        TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS exams (
+    id               INTEGER PRIMARY KEY AUTOINCREMENT,
+    slug             TEXT UNIQUE NOT NULL,
+    title            TEXT NOT NULL,
+    role_title       TEXT DEFAULT '',
+    questions_json   TEXT NOT NULL,
+    duration_minutes INTEGER DEFAULT 60,
+    num_questions    INTEGER DEFAULT 10,
+    recruiter_email  TEXT NOT NULL,
+    created_at       TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+-- slug lookups use the UNIQUE autoindex; the recruiter's list is filtered on email, newest first.
+-- Emails are stored lowercased (see MIGRATIONS), so lookups are plain equality seeks.
+DROP INDEX IF EXISTS idx_exams_slug;
+DROP INDEX IF EXISTS idx_exams_email;
+CREATE INDEX IF NOT EXISTS idx_exams_recruiter_created ON exams(recruiter_email, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    exam_slug      TEXT NOT NULL,
+    name           TEXT NOT NULL,
+    email          TEXT NOT NULL,
+    phone          TEXT DEFAULT '',
+    started_at     TIMESTAMP,
+    submitted_at   TIMESTAMP,
+    tab_violations INTEGER DEFAULT 0,
+    created_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (exam_slug) REFERENCES exams(slug),
+    UNIQUE(exam_slug, email)
+);
+-- Serves the per-exam candidate listing already sorted by submission time
+DROP INDEX IF EXISTS idx_cands_slug;
+CREATE INDEX IF NOT EXISTS idx_cands_slug_submitted ON candidates(exam_slug, submitted_at DESC);
+
+CREATE TABLE IF NOT EXISTS answers (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    candidate_id INTEGER NOT NULL,
+    question_id  INTEGER NOT NULL,
+    selected_opt TEXT DEFAULT '',
+    is_correct   INTEGER DEFAULT 0,
+    ai_score     REAL DEFAULT -1,
+    ai_feedback  TEXT DEFAULT '',
+    created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (candidate_id) REFERENCES candidates(id) ON DELETE CASCADE
+);
+-- Per-candidate answer listing in question order, the (candidate, question) grade UPDATE,
+-- and the dashboard's SUM(is_correct), which is answered from the index alone
+DROP INDEX IF EXISTS idx_answers_cand;
+CREATE INDEX IF NOT EXISTS idx_answers_cand_q_correct ON answers(candidate_id, question_id, is_correct);
+
+-- Groq output for a job description, keyed by sha256 of the cleaned JD and question count
+CREATE TABLE IF NOT EXISTS jd_cache (
+    hash           TEXT PRIMARY KEY,
+    jd_json        TEXT NOT NULL,
+    questions_json TEXT NOT NULL,
+    created_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMIT;
+"""
+
+
+# One-time data fixes, applied in order; PRAGMA user_version records how many have run
+MIGRATIONS = [
+    # 1: recruiter emails were stored as typed; lookups now match them by plain equality
+    "UPDATE exams SET recruiter_email = LOWER(recruiter_email) WHERE recruiter_email <> LOWER(recruiter_email);",
+]
+
+
+def init_db():
+    with db_conn() as conn:
+        # WAL lets readers proceed while a writer commits; the setting sticks to the DB file.
+        # It cannot be changed inside a transaction, so it runs before the schema script.
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(SCHEMA_SQL)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for i, sql in enumerate(MIGRATIONS[version:], start=version + 1):
+            conn.executescript(f"BEGIN IMMEDIATE; {sql} PRAGMA user_version = {i}; COMMIT;")
+        conn.execute("PRAGMA optimize")
     print("✅ Database ready")
 
 
+# Exams are never edited after creation, so their parsed questions can be kept per slug
+QUESTIONS_CACHE_SIZE = 512
+_questions_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def load_questions(conn: sqlite3.Connection, slug: str) -> Optional[tuple]:
+    """(questions, {str(id): question}, mcq_total) for an exam, or None if the slug doesn't exist.
+
+    questions_json is only read from the database on a cache miss. Callers must not mutate the result.
+    """
+    entry = _questions_cache.get(slug)
+    if entry is not None:
+        _questions_cache.move_to_end(slug)
+        return entry
+    row = conn.execute("SELECT questions_json FROM exams WHERE slug = ?", (slug,)).fetchone()
+    if not row:
+        return None
+    qs = orjson.loads(row["questions_json"])
+    for q in qs:   # exams created before answers were normalized at generation time
+        if q.get("type", "MCQ") == "MCQ":
+            q["correct_answer"] = (q.get("correct_answer") or "").upper().strip()
+    entry = (qs, {str(q["id"]): q for q in qs}, sum(1 for q in qs if q.get("type", "MCQ") == "MCQ"))
+    _questions_cache[slug] = entry
+    if len(_questions_cache) > QUESTIONS_CACHE_SIZE:
+        _questions_cache.popitem(last=False)
+    return entry
+
+
+# Rendered candidate pages as (html, gzipped html, brotli html), keyed by slug; immutable for the same reason as above
+EXAM_PAGE_CACHE_SIZE = 256
+_exam_page_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
 # ─── App Setup ────────────────────────────────────────────────────────────────
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global _groq_client
     init_db()
+    prime_db_pool()
+    await warm_groq()
+    workers = start_scoring_workers()
     yield
+    await stop_scoring_workers(workers)
+    if _groq_client is not None:
+        await _groq_client.aclose()
+        _groq_client = None
+    close_db_pool()
 
-app = FastAPI(title="Beat Claude", version="2.0.0", lifespan=lifespan)
+app = FastAPI(title="Beat Claude", version="2.0.0", lifespan=lifespan,
+              default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,   # browsers reuse a preflight for a day instead of re-sending OPTIONS per call
 )
+# Level 6 runs ~4x faster than the default 9 for a few % larger output; this is per response, on the event loop.
+# Bodies that already carry Content-Encoding (exam pages, precompressed assets) are passed through untouched.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
 
 # ─── Auth Helpers ─────────────────────────────────────────────────────────────
 
 def hash_pw(pw: str) -> str:
-    return bcrypt.hashpw(pw.encode(), bcrypt.gensalt()).decode()
+    return bcrypt.hashpw(pw.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 def verify_pw(pw: str, hashed: str) -> bool:
     return bcrypt.checkpw(pw.encode(), hashed.encode())
@@ -149,55 +299,85 @@ def require_auth(request: Request) -> str:
 
 # ─── Groq AI Helpers ─────────────────────────────────────────────────────────
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(1, 10))
-async def call_groq(prompt: str, system: str = "") -> str:
-    """Call Groq chat completions API."""
-    if not GROQ_API_KEY:
-        raise HTTPException(status_code=500, detail="GROQ_API_KEY not configured on server.")
-    async with httpx.AsyncClient(timeout=120) as client:
-        r = await client.post(
-            "https://api.groq.com/openai/v1/chat/completions",
+_groq_client: Optional[httpx.AsyncClient] = None
+
+
+def groq_client() -> httpx.AsyncClient:
+    """Shared keep-alive client so Groq calls skip the TCP/TLS handshake. Closed in lifespan()."""
+    global _groq_client
+    if _groq_client is None:
+        _groq_client = httpx.AsyncClient(
+            base_url="https://api.groq.com/openai/v1",
             headers={"Authorization": f"Bearer {GROQ_API_KEY}", "Content-Type": "application/json"},
-            json={
-                "model": GROQ_MODEL,
-                "messages": [
-                    {"role": "system", "content": system},
-                    {"role": "user",   "content": prompt},
-                ],
-                "temperature": 0.2,
-                "top_p": 0.8,
-            },
+            timeout=httpx.Timeout(120.0, connect=5.0),
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=300),
         )
+    return _groq_client
+
+
+async def warm_groq():
+    """Open the keep-alive connection to Groq at startup so the first exam
+    creation doesn't pay the TLS handshake. Failures are only logged."""
+    if not GROQ_API_KEY:
+        return
+    try:
+        r = await groq_client().get("/models", timeout=5.0)
         r.raise_for_status()
-        return r.json()["choices"][0]["message"]["content"]
+    except Exception as ex:
+        print(f"⚠️  Groq warm-up failed: {ex}")
 
 
-def strip_injections(text: str) -> str:
-    patterns = [
-        r'ignore\s+(previous|above|all)\s+instructions?',
-        r'(system|assistant|user)\s*:\s*',
-        r'<\s*(system|assistant|user)\s*>',
-        r'\[\s*(INST|SYS|END)\s*\]',
-        r'###\s*(instruction|system|prompt)',
-        r'act\s+as\s+(if|though)',
-        r'new\s+role',
-        r'forget\s+(your|all|previous)',
-    ]
-    for p in patterns:
-        text = re.sub(p, '[REMOVED]', text, flags=re.IGNORECASE)
-    return text[:10000]
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(1, 10))
+async def call_groq(prompt: str, system: str = "", json_mode: bool = False) -> str:
+    """Call Groq chat completions API. `json_mode` constrains the reply to a single JSON object."""
+    if not GROQ_API_KEY:
+        raise HTTPException(status_code=500, detail="GROQ_API_KEY not configured on server.")
+    body = {
+        "model": GROQ_MODEL,
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user",   "content": prompt},
+        ],
+        "temperature": 0.2,
+        "top_p": 0.8,
+    }
+    if json_mode:
+        body["response_format"] = {"type": "json_object"}
+    r = await groq_client().post("/chat/completions", json=body)
+    r.raise_for_status()
+    return r.json()["choices"][0]["message"]["content"]
 
 
-async def parse_jd(jd_text: str) -> dict:
-    system = ("You are an expert HR assistant. Extract structured information from job descriptions. "
-              "Return ONLY valid JSON. No commentary.")
-    prompt = f"""Parse this job description:
+_INJECTION_PATTERNS = [
+    r'ignore\s+(previous|above|all)\s+instructions?',
+    r'(system|assistant|user)\s*:\s*',
+    r'<\s*(system|assistant|user)\s*>',
+    r'\[\s*(INST|SYS|END)\s*\]',
+    r'###\s*(instruction|system|prompt)',
+    r'act\s+as\s+(if|though)',
+    r'new\s+role',
+    r'forget\s+(your|all|previous)',
+]
+# One alternation compiled at import: a single scan per call instead of one re.sub per pattern
+_INJECTION_RE = re.compile("|".join(f"(?:{p})" for p in _INJECTION_PATTERNS), re.IGNORECASE)
 
-JOB DESCRIPTION:
-{jd_text}
 
-Return ONLY this JSON (no markdown):
-{{
+MAX_PROMPT_TEXT = 10000
+
+
+def strip_injections(text: str) -> str:
+    # Only the first MAX_PROMPT_TEXT chars are kept, so don't scan an arbitrarily long
+    # payload to produce them; the 2x margin absorbs matches shortened to '[REMOVED]'
+    return _INJECTION_RE.sub('[REMOVED]', text[:2 * MAX_PROMPT_TEXT])[:MAX_PROMPT_TEXT]
+
+
+# ─── Prompts ──────────────────────────────────────────────────────────────────
+# Static instructions/schemas are built once; only the per-call values are formatted in.
+
+PARSE_JD_SYSTEM = ("You are an expert HR assistant. Extract structured information from job descriptions. "
+                   "Return ONLY valid JSON. No commentary.")
+PARSE_JD_SCHEMA = """Return ONLY this JSON (no markdown):
+{
     "role_title": "Job title",
     "seniority_level": "entry/junior/mid/senior/lead",
     "department": "Department name",
@@ -209,48 +389,17 @@ Return ONLY this JSON (no markdown):
     "tools_technologies": ["tool1"],
     "key_responsibilities": ["resp1"],
     "soft_skills": ["skill1"]
-}}
+}
 Use "NOT SPECIFIED" for missing strings and [] for missing arrays."""
-    try:
-        resp = await call_groq(prompt, system)
-        s, e = resp.find('{'), resp.rfind('}') + 1
-        return json.loads(resp[s:e]) if s >= 0 and e > s else json.loads(resp)
-    except Exception as ex:
-        print(f"JD parse error: {ex}")
-        return {"role_title": "Unknown", "seniority_level": "mid", "department": "NOT SPECIFIED",
-                "domain": "NOT SPECIFIED", "years_of_experience_required": "NOT SPECIFIED",
-                "education_requirements": "NOT SPECIFIED", "required_skills": [],
-                "preferred_skills": [], "tools_technologies": [],
-                "key_responsibilities": [], "soft_skills": []}
-
-
-async def generate_questions(jd: dict, num: int = 10) -> list:
-    system = ("You are an expert technical interviewer. Create high-quality interview questions. "
-              "Return ONLY valid JSON array. No markdown.")
-    skills = ", ".join(jd.get("required_skills", [])[:6])
-    seniority = jd.get("seniority_level", "mid").lower()
-    if seniority in ["senior", "lead", "principal"]:
-        ratio = "20% MCQ, 30% SHORT_ANSWER, 50% SCENARIO"
-    elif seniority in ["junior", "entry"]:
-        ratio = "50% MCQ, 30% SHORT_ANSWER, 20% SCENARIO"
-    else:
-        ratio = "30% MCQ, 30% SHORT_ANSWER, 40% SCENARIO"
-
-    prompt = f"""Generate exactly {num} interview questions for this role.
-
-ROLE: {jd.get('role_title', 'Unknown')}
-SENIORITY: {seniority}
-REQUIRED SKILLS: {skills}
-RESPONSIBILITIES: {', '.join(jd.get('key_responsibilities', [])[:3])}
 
-Create a mix: {ratio}
-
-For MCQ: options = ["Option A", "Option B", "Option C", "Option D"], correct_answer = "A"|"B"|"C"|"D"
+GEN_Q_SYSTEM = ("You are an expert technical interviewer. Create high-quality interview questions. "
+                "Return ONLY valid JSON array. No markdown.")
+GEN_Q_FORMAT = """For MCQ: options = ["Option A", "Option B", "Option C", "Option D"], correct_answer = "A"|"B"|"C"|"D"
 For SHORT_ANSWER/SCENARIO: options = [], correct_answer = ""
 
 Return ONLY this JSON array:
 [
-  {{
+  {
     "id": 1,
     "type": "MCQ",
     "skill": "specific skill",
@@ -260,8 +409,8 @@ Return ONLY this JSON array:
     "correct_answer": "A",
     "guidelines": "Why A is correct and what to look for",
     "max_score": 10
-  }},
-  {{
+  },
+  {
     "id": 2,
     "type": "SHORT_ANSWER",
     "skill": "specific skill",
@@ -271,12 +420,70 @@ Return ONLY this JSON array:
     "correct_answer": "",
     "guidelines": "Key points the ideal answer should cover",
     "max_score": 10
-  }}
+  }
 ]"""
+
+SCORE_SYSTEM = ("You are an expert technical interviewer. Score responses objectively. "
+                "Return ONLY valid JSON.")
+SCORE_PROMPT = """Score this candidate response.
+
+QUESTION: {question}
+IDEAL ANSWER GUIDELINES: {guidelines}
+CANDIDATE'S ANSWER: {answer}
+MAXIMUM SCORE: {max_score}
+
+Be strict. No points for empty or irrelevant answers.
+
+Return ONLY this JSON:
+{{
+    "score": <number 0 to {max_score}>,
+    "reasoning": "Brief explanation",
+    "feedback": "Constructive feedback for the candidate"
+}}"""
+
+
+# Used when the JD can't be parsed, so questions are still generated (just less targeted)
+JD_FALLBACK = {"role_title": "Unknown", "seniority_level": "mid", "department": "NOT SPECIFIED",
+               "domain": "NOT SPECIFIED", "years_of_experience_required": "NOT SPECIFIED",
+               "education_requirements": "NOT SPECIFIED", "required_skills": [],
+               "preferred_skills": [], "tools_technologies": [],
+               "key_responsibilities": [], "soft_skills": []}
+
+
+async def parse_jd(jd_text: str) -> Optional[dict]:
+    """Structured JD from Groq, or None if the call or its JSON failed."""
+    prompt = f"Parse this job description:\n\nJOB DESCRIPTION:\n{jd_text}\n\n{PARSE_JD_SCHEMA}"
     try:
-        resp = await call_groq(prompt, system)
+        return orjson.loads(await call_groq(prompt, PARSE_JD_SYSTEM, json_mode=True))
+    except Exception as ex:
+        print(f"JD parse error: {ex}")
+        return None
+
+
+async def generate_questions(jd: dict, num: int = 10) -> list:
+    skills = ", ".join(jd.get("required_skills", [])[:6])
+    seniority = jd.get("seniority_level", "mid").lower()
+    if seniority in ["senior", "lead", "principal"]:
+        ratio = "20% MCQ, 30% SHORT_ANSWER, 50% SCENARIO"
+    elif seniority in ["junior", "entry"]:
+        ratio = "50% MCQ, 30% SHORT_ANSWER, 20% SCENARIO"
+    else:
+        ratio = "30% MCQ, 30% SHORT_ANSWER, 40% SCENARIO"
+
+    prompt = f"""Generate exactly {num} interview questions for this role.
+
+ROLE: {jd.get('role_title', 'Unknown')}
+SENIORITY: {seniority}
+REQUIRED SKILLS: {skills}
+RESPONSIBILITIES: {', '.join(jd.get('key_responsibilities', [])[:3])}
+
+Create a mix: {ratio}
+
+{GEN_Q_FORMAT}"""
+    try:
+        resp = await call_groq(prompt, GEN_Q_SYSTEM)
         s, e = resp.find('['), resp.rfind(']') + 1
-        qs = json.loads(resp[s:e]) if s >= 0 and e > s else json.loads(resp)
+        qs = orjson.loads(resp[s:e] if s >= 0 and e > s else resp)
         clean = []
         for i, q in enumerate(qs):
             if not q.get("question"):
@@ -288,6 +495,8 @@ Return ONLY this JSON array:
             if q["type"] != "MCQ":
                 q["options"] = []
                 q["correct_answer"] = ""
+            else:
+                q["correct_answer"] = (q.get("correct_answer") or "").upper().strip()
             q["max_score"] = int(q.get("max_score", 10))
             clean.append(q)
         return clean
@@ -297,29 +506,14 @@ Return ONLY this JSON array:
 
 
 async def score_answer(question: str, guidelines: str, answer: str, max_score: int) -> dict:
-    system = ("You are an expert technical interviewer. Score responses objectively. "
-              "Return ONLY valid JSON.")
     answer = strip_injections(answer or "")
-    prompt = f"""Score this candidate response.
-
-QUESTION: {question}
-IDEAL ANSWER GUIDELINES: {guidelines}
-CANDIDATE'S ANSWER: {answer if answer else "(no answer provided)"}
-MAXIMUM SCORE: {max_score}
-
-Be strict. No points for empty or irrelevant answers.
-
-Return ONLY this JSON:
-{{
-    "score": <number 0 to {max_score}>,
-    "reasoning": "Brief explanation",
-    "feedback": "Constructive feedback for the candidate"
-}}"""
+    prompt = SCORE_PROMPT.format_map({
+        "question": question, "guidelines": guidelines,
+        "answer": answer if answer else "(no answer provided)", "max_score": max_score,
+    })
     for attempt in range(3):
         try:
-            resp = await call_groq(prompt, system)
-            s, e = resp.find('{'), resp.rfind('}') + 1
-            result = json.loads(resp[s:e] if s >= 0 and e > s else resp)
+            result = orjson.loads(await call_groq(prompt, SCORE_SYSTEM, json_mode=True))
             score = float(result.get("score", 0))
             return {
                 "score": max(0.0, min(float(max_score), score)),
@@ -334,38 +528,35 @@ Return ONLY this JSON:
 
 @app.post("/auth/signup")
 async def signup(request: Request):
-    data = await request.json()
+    data = orjson.loads(await request.body())
     email = (data.get("email") or "").strip().lower()
     password = data.get("password", "")
     if not email or "@" not in email:
         raise HTTPException(400, "Valid email is required")
     if not password or len(password) < 6:
         raise HTTPException(400, "Password must be at least 6 characters")
-    conn = get_db()
-    c = conn.cursor()
-    c.execute("SELECT id FROM users WHERE email = ?", (email,))
-    if c.fetchone():
-        conn.close()
-        raise HTTPException(400, "An account with this email already exists")
-    c.execute("INSERT INTO users (email, password_hash) VALUES (?, ?)", (email, hash_pw(password)))
-    conn.commit()
-    conn.close()
+    # bcrypt is deliberately slow; hash on a worker thread so the event loop keeps serving
+    password_hash = await run_in_threadpool(hash_pw, password)
+    with db_conn() as conn:
+        # The UNIQUE(email) constraint does the duplicate check; no row back means it already exists
+        row = conn.execute("""INSERT INTO users (email, password_hash) VALUES (?, ?)
+                              ON CONFLICT(email) DO NOTHING RETURNING id""",
+                           (email, password_hash)).fetchone()
+        if not row:
+            raise HTTPException(400, "An account with this email already exists")
     return {"success": True, "token": make_jwt(email), "email": email}
 
 
 @app.post("/auth/signin")
 async def signin(request: Request):
-    data = await request.json()
+    data = orjson.loads(await request.body())
     email = (data.get("email") or "").strip().lower()
     password = data.get("password", "")
     if not email or not password:
         raise HTTPException(400, "Email and password are required")
-    conn = get_db()
-    c = conn.cursor()
-    c.execute("SELECT password_hash FROM users WHERE email = ?", (email,))
-    row = c.fetchone()
-    conn.close()
-    if not row or not verify_pw(password, row["password_hash"]):
+    with db_conn() as conn:
+        row = conn.execute("SELECT password_hash FROM users WHERE email = ?", (email,)).fetchone()
+    if not row or not await run_in_threadpool(verify_pw, password, row["password_hash"]):
         raise HTTPException(401, "Invalid email or password")
     return {"success": True, "token": make_jwt(email), "email": email}
 
@@ -382,7 +573,7 @@ async def auth_me(request: Request):
 async def create_exam(request: Request):
     """Recruiter creates an exam — calls Groq directly to generate questions."""
     email = require_auth(request)
-    data = await request.json()
+    data = orjson.loads(await request.body())
     jd_text       = (data.get("job_description") or "").strip()
     num_questions = min(20, max(5, int(data.get("num_questions", 10))))
     duration      = min(180, max(15, int(data.get("duration_minutes", 60))))
@@ -391,29 +582,51 @@ async def create_exam(request: Request):
         raise HTTPException(400, "Job description is too short (min 30 chars)")
 
     jd_clean = strip_injections(jd_text)
-    jd_data  = await parse_jd(jd_clean)
-    questions = await generate_questions(jd_data, num_questions)
+    jd_key   = hashlib.sha256(f"{num_questions}:{jd_clean}".encode()).hexdigest()
+    with db_conn() as conn:
+        cached = conn.execute("SELECT jd_json, questions_json FROM jd_cache WHERE hash = ? AND created_at > datetime('now', ?)",
+                              (jd_key, f"-{JD_CACHE_TTL_H} hours")).fetchone()
+    if cached:
+        jd_data, questions = orjson.loads(cached["jd_json"]), orjson.loads(cached["questions_json"])
+    else:
+        jd_data  = await parse_jd(jd_clean)
+        parsed   = jd_data is not None
+        if not parsed:
+            jd_data = JD_FALLBACK
+        questions = await generate_questions(jd_data, num_questions)
+        # A fallback parse is not cached, so a transient Groq failure isn't reused for JD_CACHE_TTL_H
+        if questions and parsed:
+            with db_conn() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                # Expired rows are never read again; pruning them here keeps the table bounded
+                conn.execute("DELETE FROM jd_cache WHERE created_at <= datetime('now', ?)",
+                             (f"-{JD_CACHE_TTL_H} hours",))
+                conn.execute("""INSERT INTO jd_cache (hash, jd_json, questions_json) VALUES (?, ?, ?)
+                                ON CONFLICT(hash) DO UPDATE SET jd_json = excluded.jd_json,
+                                    questions_json = excluded.questions_json, created_at = CURRENT_TIMESTAMP""",
+                             (jd_key, orjson.dumps(jd_data).decode(), orjson.dumps(questions).decode()))
+                conn.commit()
 
     if not questions:
         raise HTTPException(500, "Failed to generate questions. Check your GROQ_API_KEY.")
 
-    slug = secrets.token_urlsafe(9)
-    conn = get_db()
-    c = conn.cursor()
-    while True:
-        c.execute("SELECT id FROM exams WHERE slug = ?", (slug,))
-        if not c.fetchone():
-            break
-        slug = secrets.token_urlsafe(9)
-
     title = f"{jd_data.get('role_title', 'Untitled')} — Assessment"
-    c.execute("""
-        INSERT INTO exams (slug, title, role_title, questions_json, duration_minutes, num_questions, recruiter_email)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (slug, title, jd_data.get("role_title", ""), json.dumps(questions),
-          duration, len(questions), email))
-    conn.commit()
-    conn.close()
+    questions_json = orjson.dumps(questions).decode()
+    with db_conn() as conn:
+        # slug is UNIQUE, so a collision surfaces as IntegrityError; retry with a fresh slug
+        for _ in range(5):
+            slug = secrets.token_urlsafe(9)
+            try:
+                conn.execute("""
+                    INSERT INTO exams (slug, title, role_title, questions_json, duration_minutes, num_questions, recruiter_email)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (slug, title, jd_data.get("role_title", ""), questions_json,
+                      duration, len(questions), email))
+                break
+            except sqlite3.IntegrityError:
+                continue
+        else:
+            raise HTTPException(500, "Could not allocate an exam link, please retry")
 
     exam_link = f"{APP_URL.rstrip('/')}/exam/{slug}"
     return {"success": True, "slug": slug, "exam_link": exam_link,
@@ -425,67 +638,75 @@ async def create_exam(request: Request):
 @app.get("/recruiter/exams")
 async def recruiter_exams(email: str = ""):
     """Return all exams for a recruiter email with candidate stats."""
+    email = email.strip().lower()
     if not email:
         raise HTTPException(400, "email parameter required")
-    conn = get_db()
-    c = conn.cursor()
-    c.execute("SELECT * FROM exams WHERE LOWER(recruiter_email) = LOWER(?) ORDER BY created_at DESC",
-              (email.strip(),))
-    exams = [dict(r) for r in c.fetchall()]
+    with db_conn() as conn:
+        c = conn.cursor()
+        c.execute("""SELECT slug, title, role_title, num_questions, duration_minutes, created_at
+                     FROM exams WHERE recruiter_email = ? ORDER BY created_at DESC""",
+                  (email,))
+        exams = c.fetchall()
+        # Correct-answer count for every submitted candidate across all of this recruiter's exams.
+        # Plain tuples: this loop runs once per candidate and only needs positional access.
+        c.row_factory = None
+        c.execute("""SELECT cd.exam_slug, COALESCE(SUM(a.is_correct), 0) AS correct
+                     FROM exams e
+                     JOIN candidates cd ON cd.exam_slug = e.slug AND cd.submitted_at IS NOT NULL
+                     LEFT JOIN answers a ON a.candidate_id = cd.id
+                     WHERE e.recruiter_email = ?
+                     GROUP BY cd.id""", (email,))
+        correct_by_exam = {}
+        for exam_slug, correct in c:
+            correct_by_exam.setdefault(exam_slug, []).append(correct)
 
     result = []
     for ex in exams:
         slug = ex["slug"]
-        c.execute("SELECT COUNT(*) as cnt FROM candidates WHERE exam_slug = ? AND submitted_at IS NOT NULL", (slug,))
-        cc = c.fetchone()["cnt"]
-        avg = 0
-        if cc > 0:
-            qs = json.loads(ex["questions_json"])
-            total_q = len(qs)
-            c.execute("SELECT id FROM candidates WHERE exam_slug = ? AND submitted_at IS NOT NULL", (slug,))
-            cids = [r["id"] for r in c.fetchall()]
-            scores = []
-            for cid in cids:
-                c.execute("SELECT SUM(is_correct) as correct FROM answers WHERE candidate_id = ?", (cid,))
-                row = c.fetchone()
-                correct = row["correct"] or 0
-                scores.append(round(correct / total_q * 100) if total_q > 0 else 0)
-            avg = round(sum(scores) / len(scores)) if scores else 0
+        correct_counts = correct_by_exam.get(slug, [])
+        cc = len(correct_counts)
+        total_q = ex["num_questions"]
+        scores = [round(n / total_q * 100) if total_q > 0 else 0 for n in correct_counts]
+        avg = round(sum(scores) / len(scores)) if scores else 0
         result.append({
             "slug": slug, "title": ex["title"], "role_title": ex["role_title"],
             "num_questions": ex["num_questions"], "duration_minutes": ex["duration_minutes"],
             "candidate_count": cc, "avg_score": avg, "created_at": ex["created_at"],
             "exam_link": f"{APP_URL.rstrip('/')}/exam/{slug}",
         })
-    conn.close()
     return {"success": True, "exams": result}
 
 
 @app.get("/recruiter/results/{slug}")
 async def recruiter_results(slug: str, request: Request):
     """Return full results for an exam."""
-    conn = get_db()
-    c = conn.cursor()
-    c.execute("SELECT * FROM exams WHERE slug = ?", (slug,))
-    exam = c.fetchone()
-    if not exam:
-        conn.close()
-        raise HTTPException(404, "Exam not found")
-
-    questions = json.loads(exam["questions_json"])
-    q_map = {q["id"]: q for q in questions}
-
-    c.execute("SELECT * FROM candidates WHERE exam_slug = ? ORDER BY submitted_at DESC", (slug,))
-    candidates = [dict(r) for r in c.fetchall()]
+    with db_conn() as conn:
+        c = conn.cursor()
+        c.execute("""SELECT slug, title, role_title, num_questions, duration_minutes, recruiter_email, created_at
+                     FROM exams WHERE slug = ?""", (slug,))
+        exam = c.fetchone()
+        if not exam:
+            raise HTTPException(404, "Exam not found")
+        questions, q_map, mcq_total = load_questions(conn, slug)
+        c.execute("SELECT * FROM candidates WHERE exam_slug = ? ORDER BY submitted_at DESC", (slug,))
+        candidates = [dict(r) for r in c.fetchall()]
+        # Every answer for the exam in one pass; a JOIN keeps the SQL text fixed regardless of candidate count.
+        # Plain tuples, as this is the largest result set the app reads.
+        c.row_factory = None
+        c.execute("""SELECT a.candidate_id, a.question_id, a.selected_opt, a.is_correct, a.ai_score, a.ai_feedback
+                     FROM answers a JOIN candidates cd ON cd.id = a.candidate_id
+                     WHERE cd.exam_slug = ? ORDER BY a.candidate_id, a.question_id""", (slug,))
+        answers_by_cand = {}
+        for cid, *answer in c:
+            answers_by_cand.setdefault(cid, []).append(answer)
 
     for cand in candidates:
-        c.execute("SELECT * FROM answers WHERE candidate_id = ? ORDER BY question_id", (cand["id"],))
-        raw = [dict(r) for r in c.fetchall()]
         enriched = []
-        for a in raw:
-            q = q_map.get(a["question_id"], {})
+        mcq_correct, ai_total, ai_count = 0, 0.0, 0
+        for question_id, selected_opt, is_correct, ai_score, ai_feedback in answers_by_cand.get(cand["id"], []):
+            q = q_map.get(str(question_id), {})
             enriched.append({
-                "question_id": a["question_id"],
+                "question_id": question_id,
                 "question_text": q.get("question", ""),
                 "question_type": q.get("type", "MCQ"),
                 "options": q.get("options", []),
@@ -493,22 +714,23 @@ async def recruiter_results(slug: str, request: Request):
                 "skill": q.get("skill", ""),
                 "difficulty": q.get("difficulty", "medium"),
                 "max_score": q.get("max_score", 10),
-                "candidate_answer": a["selected_opt"],
-                "is_correct": a["is_correct"],
-                "ai_score": a["ai_score"],
-                "ai_feedback": a["ai_feedback"],
+                "candidate_answer": selected_opt,
+                "is_correct": is_correct,
+                "ai_score": ai_score,
+                "ai_feedback": ai_feedback,
             })
+            if is_correct:
+                mcq_correct += 1
+            if ai_score >= 0:
+                ai_total += ai_score
+                ai_count += 1
         cand["answers"] = enriched
-        mcq_correct = sum(1 for a in enriched if a["is_correct"])
-        mcq_total   = sum(1 for q in questions if q.get("type", "MCQ") == "MCQ")
-        ai_scored   = [a for a in enriched if a["ai_score"] >= 0]
-        ai_avg      = sum(a["ai_score"] for a in ai_scored) / len(ai_scored) if ai_scored else 0
+        ai_avg = ai_total / ai_count if ai_count else 0
         cand["mcq_score"]      = f"{mcq_correct}/{mcq_total}" if mcq_total > 0 else "N/A"
         cand["mcq_correct"]    = mcq_correct
         cand["mcq_total"]      = mcq_total
         cand["ai_average"]     = round(ai_avg, 1)
         cand["total_questions"] = len(questions)
-    conn.close()
 
     return {
         "success": True,
@@ -525,34 +747,65 @@ async def recruiter_results(slug: str, request: Request):
 # ─── Candidate Exam Routes ────────────────────────────────────────────────────
 
 @app.get("/exam/{slug}", response_class=HTMLResponse)
-async def exam_page(slug: str):
+async def exam_page(slug: str, request: Request):
     """Serve the candidate exam page (HTML)."""
-    conn = get_db()
-    c = conn.cursor()
-    c.execute("SELECT * FROM exams WHERE slug = ?", (slug,))
-    exam = c.fetchone()
-    conn.close()
+    entry = _exam_page_cache.get(slug)
+    if entry is not None:
+        _exam_page_cache.move_to_end(slug)
+        return _exam_page_response(entry, request)
+
+    with db_conn() as conn:
+        exam = conn.execute("SELECT title, role_title, duration_minutes, num_questions FROM exams WHERE slug = ?",
+                            (slug,)).fetchone()
+        if exam:
+            questions, _, _ = load_questions(conn, slug)
     if not exam:
         return HTMLResponse(_error_html("Exam Not Found", "This exam link is invalid or has expired."), 404)
 
-    questions = json.loads(exam["questions_json"])
+    # Serializing, templating and gzip are pure CPU; run them off the event loop (once per slug)
+    entry = await run_in_threadpool(_render_exam_page, slug, exam, questions)
+    _exam_page_cache[slug] = entry
+    if len(_exam_page_cache) > EXAM_PAGE_CACHE_SIZE:
+        _exam_page_cache.popitem(last=False)
+    return _exam_page_response(entry, request)
+
+
+def _render_exam_page(slug: str, exam: sqlite3.Row, questions: list) -> tuple:
+    """(html, gzip, brotli) bodies for an exam page, with answers and guidelines stripped from the questions."""
     safe_qs = [
         {"id": q["id"], "question": q["question"], "options": q.get("options", []),
          "type": q.get("type", "MCQ"), "skill": q.get("skill", ""),
          "difficulty": q.get("difficulty", "medium"), "max_score": q.get("max_score", 10)}
         for q in questions
     ]
-    return HTMLResponse(_exam_html(
-        slug=slug, title=exam["title"], role_title=exam["role_title"],
-        duration=exam["duration_minutes"], questions_json=json.dumps(safe_qs),
-        num_questions=exam["num_questions"],
-    ))
+    # Embedded as JSON.parse('...'): browsers parse the JSON grammar faster than an object literal.
+    # "<" becomes \u003c first, so no question text can close the <script> block early.
+    config = orjson.dumps({"slug": slug, "duration": exam["duration_minutes"], "questions": safe_qs}).decode()
+    config_js = config.replace("<", "\\u003c").replace("\\", "\\\\").replace("'", "\\'")
+    # Titles come from the recruiter / AI; escaped here once per cached page, so _exam_html takes them as-is
+    page = _exam_html(
+        title=html.escape(exam["title"]), role_title=html.escape(exam["role_title"] or ""),
+        duration=exam["duration_minutes"],
+        config_js=config_js, num_questions=exam["num_questions"],
+    ).encode()
+    # Compressed once at the highest levels here, so no request ever pays for compression
+    return page, gzip.compress(page, compresslevel=9, mtime=0), brotli.compress(page, quality=11)
+
+
+def _exam_page_response(entry: tuple, request: Request) -> HTMLResponse:
+    page, page_gz, page_br = entry
+    accept = request.headers.get("accept-encoding", "")
+    if "br" in accept:
+        return HTMLResponse(page_br, headers={"Content-Encoding": "br", "Vary": "Accept-Encoding"})
+    if "gzip" in accept:
+        return HTMLResponse(page_gz, headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+    return HTMLResponse(page, headers={"Vary": "Accept-Encoding"})
 
 
 @app.post("/exam/{slug}/submit")
-async def submit_exam(slug: str, request: Request, background_tasks: BackgroundTasks):
+async def submit_exam(slug: str, request: Request):
     """Submit candidate answers; auto-grade MCQs; score open-ended in background."""
-    data = await request.json()
+    data = orjson.loads(await request.body())
     name           = (data.get("name") or "").strip()
     cand_email     = (data.get("email") or "").strip().lower()
     phone          = (data.get("phone") or "").strip()
@@ -562,85 +815,123 @@ async def submit_exam(slug: str, request: Request, background_tasks: BackgroundT
     if not name or not cand_email:
         raise HTTPException(400, "Name and email are required")
 
-    conn = get_db()
-    c = conn.cursor()
-    c.execute("SELECT * FROM exams WHERE slug = ?", (slug,))
-    exam = c.fetchone()
-    if not exam:
-        conn.close()
-        raise HTTPException(404, "Exam not found")
-
-    # Check duplicate submission
-    c.execute("SELECT id, submitted_at FROM candidates WHERE exam_slug = ? AND email = ?",
-              (slug, cand_email))
-    existing = c.fetchone()
-    if existing and existing["submitted_at"]:
-        conn.close()
-        raise HTTPException(400, "You have already submitted this exam")
-
-    # Upsert candidate
-    if existing:
-        candidate_id = existing["id"]
-        c.execute("UPDATE candidates SET submitted_at = CURRENT_TIMESTAMP, tab_violations = ? WHERE id = ?",
-                  (tab_violations, candidate_id))
-    else:
+    with db_conn() as conn:
+        c = conn.cursor()
+        exam = load_questions(conn, slug)
+        if not exam:
+            raise HTTPException(404, "Exam not found")
+        _, q_map, _ = exam
+
+        c.execute("BEGIN IMMEDIATE")
+        # Upsert candidate and check for a duplicate submission in one atomic statement:
+        # no row comes back if this email has already submitted the exam
         c.execute("""INSERT INTO candidates (exam_slug, name, email, phone, started_at, submitted_at, tab_violations)
-                     VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, ?)""",
+                     VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, ?)
+                     ON CONFLICT(exam_slug, email) DO UPDATE
+                         SET submitted_at = CURRENT_TIMESTAMP, tab_violations = excluded.tab_violations
+                         WHERE submitted_at IS NULL
+                     RETURNING id""",
                   (slug, name, cand_email, phone, tab_violations))
-        candidate_id = c.lastrowid
-
-    questions = json.loads(exam["questions_json"])
-    q_map = {str(q["id"]): q for q in questions}
-    mcq_correct, mcq_total, open_ended = 0, 0, []
+        claimed = c.fetchone()
+        if not claimed:
+            raise HTTPException(400, "You have already submitted this exam")
+        candidate_id = claimed["id"]
 
-    for qid_str, selected in answers_map.items():
-        q = q_map.get(qid_str)
-        if not q:
-            continue
-        is_correct, ai_score, ai_fb = 0, -1.0, ""
-        if q.get("type", "MCQ") == "MCQ":
-            mcq_total += 1
-            if ((q.get("correct_answer") or "").upper().strip() ==
-                    (selected or "").upper().strip()):
-                is_correct = 1
-                mcq_correct += 1
-        else:
-            open_ended.append({
-                "q_id": qid_str, "question": q.get("question", ""),
-                "guidelines": q.get("guidelines", ""),
-                "answer": selected or "",
-                "max_score": q.get("max_score", 10),
-            })
-        c.execute("""INSERT INTO answers (candidate_id, question_id, selected_opt, is_correct, ai_score, ai_feedback)
-                     VALUES (?, ?, ?, ?, ?, ?)""",
-                  (candidate_id, int(qid_str), selected or "", is_correct, ai_score, ai_fb))
+        mcq_correct, mcq_total, open_ended, answer_rows = 0, 0, [], []
 
-    conn.commit()
-    conn.close()
+        for qid_str, selected in answers_map.items():
+            q = q_map.get(qid_str)
+            if not q:
+                continue
+            is_correct, ai_score, ai_fb = 0, -1.0, ""
+            if q.get("type", "MCQ") == "MCQ":
+                mcq_total += 1
+                if q["correct_answer"] == (selected or "").upper().strip():
+                    is_correct = 1
+                    mcq_correct += 1
+            else:
+                open_ended.append({
+                    "q_id": qid_str, "question": q.get("question", ""),
+                    "guidelines": q.get("guidelines", ""),
+                    "answer": selected or "",
+                    "max_score": q.get("max_score", 10),
+                })
+            answer_rows.append((candidate_id, int(qid_str), selected or "", is_correct, ai_score, ai_fb))
+
+        c.executemany("""INSERT INTO answers (candidate_id, question_id, selected_opt, is_correct, ai_score, ai_feedback)
+                         VALUES (?, ?, ?, ?, ?, ?)""", answer_rows)
+        conn.commit()
 
     # Score open-ended answers in the background
     if open_ended:
-        background_tasks.add_task(_score_open_ended, candidate_id, open_ended)
+        _scoring_queue.put_nowait((candidate_id, open_ended))
 
     return {"status": "submitted",
             "mcq_score": f"{mcq_correct}/{mcq_total}" if mcq_total > 0 else "N/A",
             "candidate_id": candidate_id}
 
 
+# Submissions waiting for open-ended scoring; drained by the workers started in lifespan()
+_scoring_queue: Optional[asyncio.Queue] = None
+
+
+def start_scoring_workers() -> list:
+    """Spawn the scoring workers; submissions are graded in arrival order, SCORING_WORKERS at a time."""
+    global _scoring_queue
+    _scoring_queue = asyncio.Queue()
+    return [asyncio.create_task(_scoring_worker()) for _ in range(SCORING_WORKERS)]
+
+
+async def stop_scoring_workers(workers: list):
+    """Let queued submissions finish scoring (up to SCORING_DRAIN_S), then stop the workers.
+    Anything still unscored is logged by candidate id so it can be re-scored."""
+    try:
+        await asyncio.wait_for(_scoring_queue.join(), timeout=SCORING_DRAIN_S)
+    except asyncio.TimeoutError:
+        print(f"⚠️  Scoring queue not drained after {SCORING_DRAIN_S}s, stopping workers")
+    for w in workers:
+        w.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    while not _scoring_queue.empty():
+        candidate_id, _ = _scoring_queue.get_nowait()
+        print(f"⚠️  Scoring dropped for candidate {candidate_id}: still queued at shutdown")
+
+
+async def _scoring_worker():
+    while True:
+        candidate_id, items = await _scoring_queue.get()
+        try:
+            await _score_open_ended(candidate_id, items)
+        except asyncio.CancelledError:
+            print(f"⚠️  Scoring dropped for candidate {candidate_id}: cancelled at shutdown")
+            raise
+        except Exception as ex:
+            print(f"⚠️  Scoring failed for candidate {candidate_id}: {ex}")
+        finally:
+            _scoring_queue.task_done()
+
+
 async def _score_open_ended(candidate_id: int, items: list):
-    """Background task: score open-ended answers via Groq."""
-    conn = get_db()
-    c = conn.cursor()
-    for item in items:
+    """Score open-ended answers via Groq, up to GROQ_CONCURRENCY at a time."""
+    slots = asyncio.Semaphore(GROQ_CONCURRENCY)
+    updates = []
+
+    async def score_one(item: dict):
         try:
-            result = await score_answer(item["question"], item["guidelines"],
-                                        item["answer"], item["max_score"])
-            c.execute("UPDATE answers SET ai_score = ?, ai_feedback = ? WHERE candidate_id = ? AND question_id = ?",
-                      (result["score"], result["feedback"], candidate_id, int(item["q_id"])))
+            async with slots:
+                result = await score_answer(item["question"], item["guidelines"],
+                                            item["answer"], item["max_score"])
+            updates.append((result["score"], result["feedback"], candidate_id, int(item["q_id"])))
         except Exception as ex:
             print(f"⚠️  Open-ended scoring failed for Q{item['q_id']}: {ex}")
-    conn.commit()
-    conn.close()
+
+    await asyncio.gather(*(score_one(item) for item in items))
+    if updates:
+        with db_conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("UPDATE answers SET ai_score = ?, ai_feedback = ? WHERE candidate_id = ? AND question_id = ?",
+                             updates)
+            conn.commit()
     print(f"✅ Scored open-ended answers for candidate {candidate_id}")
 
 
@@ -649,27 +940,88 @@ async def _score_open_ended(candidate_id: int, items: list):
 import pathlib
 FRONTEND_DIR = pathlib.Path(__file__).parent / "frontend"
 
+
+class FrontendFiles(StaticFiles):
+    """StaticFiles that lets browsers keep pages but revalidate them; unchanged files cost a 304.
+
+    Asset URLs carrying a ?v=<content hash> change whenever the file does, so those are cached for good.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        encoded = _precompressed.get(os.path.realpath(full_path))
+        if encoded is not None and response.status_code == 200:
+            response = _precompressed_response(response, encoded, scope)
+        if scope.get("query_string", b"").startswith(b"v="):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+# Shared by the /static mount and the handlers below, so every frontend file gets ETag/304 handling
+_frontend_files = FrontendFiles(directory=str(FRONTEND_DIR), check_dir=False)
+
+
+def _frontend_file(path: pathlib.Path, request: Request):
+    return _frontend_files.file_response(str(path), path.stat(), request.scope)
+
+
+# realpath -> (gzip, brotli) bodies of the versioned assets, compressed once at startup like the exam pages
+_precompressed: dict = {}
+
+
+def _precompressed_response(response: Response, encoded: tuple, scope) -> Response:
+    accept = dict(scope["headers"]).get(b"accept-encoding", b"")
+    if b"br" in accept:
+        encoding, body = "br", encoded[1]
+    elif b"gzip" in accept:
+        encoding, body = "gzip", encoded[0]
+    else:
+        return response
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    headers["Content-Encoding"] = encoding
+    headers["Vary"] = "Accept-Encoding"
+    return Response(body, headers=headers)
+
+
+def _asset_url(name: str) -> str:
+    """/static URL for a frontend asset, versioned by its content."""
+    path = FRONTEND_DIR / name
+    if not path.exists():
+        return f"/static/{name}?v=0"
+    data = path.read_bytes()
+    _precompressed[os.path.realpath(path)] = (gzip.compress(data, compresslevel=9, mtime=0),
+                                              brotli.compress(data, quality=11))
+    return f"/static/{name}?v={hashlib.sha256(data).hexdigest()[:12]}"
+
+
+# The exam page's stylesheet and script, shared by every exam and cached by browsers across them
+EXAM_CSS_URL = _asset_url("exam.css")
+EXAM_JS_URL  = _asset_url("exam.js")
+
+
 @app.get("/")
-async def root():
+async def root(request: Request):
     index = FRONTEND_DIR / "index.html"
     if index.exists():
-        return FileResponse(str(index))
+        return _frontend_file(index, request)
     return {"message": "Beat Claude API", "docs": "/docs"}
 
 # Mount static frontend (HTML, CSS, JS) at the root (/static won't work nice so use custom handler)
 if FRONTEND_DIR.exists():
-    app.mount("/static", StaticFiles(directory=str(FRONTEND_DIR)), name="static")
+    app.mount("/static", _frontend_files, name="static")
 
 @app.get("/{filename:path}")
-async def serve_frontend(filename: str):
+async def serve_frontend(filename: str, request: Request):
     """Serve any frontend file not caught by other routes."""
     file_path = FRONTEND_DIR / filename
     if file_path.exists() and file_path.is_file():
-        return FileResponse(str(file_path))
+        return _frontend_file(file_path, request)
     # Fallback to index.html for SPA-style routing
     index = FRONTEND_DIR / "index.html"
     if index.exists():
-        return FileResponse(str(index))
+        return _frontend_file(index, request)
     raise HTTPException(404, f"Not found: {filename}")
 
 
@@ -680,6 +1032,8 @@ def _error_html(title: str, msg: str) -> str:
 <html lang="en"><head>
 <meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1.0">
 <title>{title} — Beat Claude</title>
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
 <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap" rel="stylesheet">
 <style>
 *{{margin:0;padding:0;box-sizing:border-box}}
@@ -693,122 +1047,16 @@ a{{color:#7c3aed;font-weight:600;margin-top:1.5rem;display:block}}
 </body></html>"""
 
 
-def _exam_html(slug: str, title: str, role_title: str, duration: int,
-               questions_json: str, num_questions: int) -> str:
+def _exam_html(title: str, role_title: str, duration: int, config_js: str, num_questions: int) -> str:
     return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1.0">
 <title>{title} — Beat Claude Exam</title>
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
 <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&family=JetBrains+Mono:wght@500;700&display=swap" rel="stylesheet">
-<style>
-*{{margin:0;padding:0;box-sizing:border-box}}
-:root{{
-  --bg:#0a0a0b;--surface:#111113;--surface2:#18181b;--surface3:#1f1f23;
-  --border:#27272a;--border2:#3f3f46;--text:#f4f4f5;--text2:#a1a1aa;--text3:#71717a;
-  --purple:#7c3aed;--purple2:#6d28d9;--purple-glow:rgba(124,58,237,.15);
-  --purple-dim:rgba(124,58,237,.08);--gradient:linear-gradient(135deg,#7c3aed,#a855f7);
-  --green:#22c55e;--red:#ef4444;--teal:#2dd4bf;
-}}
-body{{font-family:'Inter',sans-serif;background:var(--bg);color:var(--text);min-height:100vh}}
-
-/* Header */
-.header{{background:var(--surface);border-bottom:1px solid var(--border);padding:0 1.5rem;height:64px;display:flex;align-items:center;justify-content:space-between;position:sticky;top:0;z-index:100}}
-.logo{{display:flex;align-items:center;gap:.6rem;font-weight:800;font-size:1.15rem}}
-.logo .icon{{width:30px;height:30px;background:var(--gradient);border-radius:8px;display:flex;align-items:center;justify-content:center;font-size:15px}}
-.logo span{{color:var(--purple)}}
-.timer{{font-family:'JetBrains Mono',monospace;font-size:1.4rem;font-weight:700;color:var(--purple);padding:.3rem .9rem;background:var(--purple-dim);border:1px solid rgba(124,58,237,.2);border-radius:.5rem;min-width:85px;text-align:center}}
-.timer.warn{{color:var(--red);background:rgba(239,68,68,.08);border-color:rgba(239,68,68,.2);animation:pulse 1s infinite}}
-@keyframes pulse{{0%,100%{{opacity:1}}50%{{opacity:.6}}}}
-
-/* Container */
-.container{{max-width:760px;margin:0 auto;padding:2rem 1rem}}
-
-/* Steps */
-.step{{display:none}}.step.active{{display:block;animation:fadeIn .35s ease}}
-@keyframes fadeIn{{from{{opacity:0;transform:translateY(10px)}}to{{opacity:1;transform:translateY(0)}}}}
-
-/* Card */
-.card{{background:var(--surface);border:1px solid var(--border);border-radius:1.25rem;padding:2.25rem}}
-.card h2{{font-size:1.75rem;font-weight:800;margin-bottom:.7rem}}
-.card p{{color:var(--text2);line-height:1.7;margin-bottom:1rem}}
-
-/* Info grid */
-.info-grid{{display:grid;grid-template-columns:repeat(auto-fit,minmax(160px,1fr));gap:.875rem;margin:1.25rem 0}}
-.info-item{{background:var(--surface2);border:1px solid var(--border);border-radius:.75rem;padding:1.1rem;text-align:center}}
-.info-item .value{{font-family:'JetBrains Mono',monospace;font-size:1.6rem;font-weight:700;color:var(--purple)}}
-.info-item .label{{font-size:.75rem;color:var(--text3);text-transform:uppercase;letter-spacing:.04em;margin-top:.3rem}}
-
-/* Form */
-.form-group{{margin-bottom:1.1rem}}
-.form-label{{display:block;font-weight:600;font-size:.8rem;color:var(--text2);margin-bottom:.4rem;text-transform:uppercase;letter-spacing:.04em}}
-.form-input{{width:100%;padding:.8rem 1rem;background:var(--surface2);border:1.5px solid var(--border);border-radius:.65rem;color:var(--text);font-size:1rem;font-family:inherit;transition:all .2s}}
-.form-input:focus{{outline:none;border-color:var(--purple);box-shadow:0 0 0 3px rgba(124,58,237,.1)}}
-.form-input::placeholder{{color:var(--text3)}}
-
-/* Buttons */
-.btn{{display:inline-flex;align-items:center;justify-content:center;padding:.875rem 2rem;border:none;border-radius:.65rem;font-size:1rem;font-weight:700;cursor:pointer;transition:all .2s;font-family:inherit}}
-.btn-primary{{background:var(--gradient);color:white}}
-.btn-primary:hover{{transform:translateY(-2px);box-shadow:0 8px 24px rgba(124,58,237,.3)}}
-.btn-primary:disabled{{opacity:.5;cursor:not-allowed;transform:none;box-shadow:none}}
-.btn-secondary{{background:var(--surface2);color:var(--text);border:1px solid var(--border)}}
-.btn-secondary:hover{{border-color:var(--border2)}}
-.btn-submit{{background:linear-gradient(135deg,#059669,#047857);color:white}}
-.btn-submit:hover{{box-shadow:0 8px 24px rgba(5,150,105,.25);transform:translateY(-2px)}}
-
-/* Progress */
-.progress-wrap{{margin-bottom:1.5rem}}
-.progress-meta{{display:flex;justify-content:space-between;font-size:.8rem;color:var(--text3);font-weight:700;text-transform:uppercase;letter-spacing:.04em;margin-bottom:.4rem}}
-.progress-bar{{height:5px;background:var(--surface3);border-radius:3px;overflow:hidden}}
-.progress-fill{{height:100%;background:var(--gradient);border-radius:3px;transition:width .3s}}
-
-/* Question */
-.q-meta{{display:flex;align-items:center;gap:.6rem;flex-wrap:wrap;margin-bottom:.75rem}}
-.q-badge{{padding:.2rem .55rem;border-radius:999px;font-size:.7rem;font-weight:700;text-transform:uppercase;letter-spacing:.04em}}
-.q-badge.mcq{{background:#dbeafe;color:#1d4ed8}}
-.q-badge.open{{background:#dcfce7;color:#15803d}}
-.q-skill{{padding:.3rem .75rem;border-radius:.45rem;font-size:.72rem;font-weight:700;background:var(--surface2);color:var(--text2);border:1px solid var(--border)}}
-.q-text{{font-size:1.35rem;font-weight:700;line-height:1.45;margin-bottom:1.75rem}}
-
-/* Options */
-.options{{display:flex;flex-direction:column;gap:.55rem;margin-bottom:1.5rem}}
-.option{{display:flex;align-items:center;gap:1.1rem;padding:1.1rem 1.3rem;border:1.5px solid var(--border);border-radius:.875rem;background:var(--surface2);cursor:pointer;transition:all .2s;user-select:none}}
-.option:hover{{border-color:var(--border2)}}
-.option.selected{{border-color:var(--purple);background:var(--purple-dim)}}
-.opt-letter{{width:34px;height:34px;border-radius:9px;border:1.5px solid var(--border2);background:var(--surface3);display:flex;align-items:center;justify-content:center;font-weight:800;font-size:.875rem;color:var(--text2);flex-shrink:0;transition:all .2s}}
-.option.selected .opt-letter{{background:var(--purple);border-color:var(--purple);color:white}}
-.opt-text{{font-size:.95rem;font-weight:500;line-height:1.5}}
-
-/* Text answer */
-.text-answer{{width:100%;padding:1.1rem 1.25rem;background:var(--surface2);border:1.5px solid var(--border);border-radius:.875rem;font-size:.95rem;line-height:1.65;resize:vertical;min-height:160px;font-family:inherit;color:var(--text);transition:all .2s;margin-bottom:1.5rem}}
-.text-answer:focus{{outline:none;border-color:var(--purple);box-shadow:0 0 0 3px rgba(124,58,237,.1)}}
-
-/* Nav */
-.nav-btns{{display:flex;justify-content:space-between;gap:1rem;margin-top:1.5rem}}
-.q-nav{{display:flex;flex-wrap:wrap;gap:.35rem;margin-bottom:1.5rem}}
-.q-nav-btn{{width:34px;height:34px;border:1px solid var(--border);border-radius:.45rem;font-size:.78rem;font-weight:700;cursor:pointer;background:var(--surface2);color:var(--text3);transition:all .2s}}
-.q-nav-btn.current{{background:var(--purple);color:white;border-color:var(--purple)}}
-.q-nav-btn.answered{{background:rgba(45,212,191,.08);color:var(--teal);border-color:rgba(45,212,191,.2)}}
-
-/* Tab warning */
-.tab-warn{{position:fixed;top:0;left:0;right:0;background:var(--red);color:white;text-align:center;padding:.65rem;font-weight:700;font-size:.875rem;z-index:999;transform:translateY(-100%);transition:transform .3s}}
-.tab-warn.show{{transform:translateY(0)}}
-
-/* Overlay */
-.overlay{{position:fixed;inset:0;background:rgba(10,10,11,.97);display:flex;align-items:center;justify-content:center;z-index:300;backdrop-filter:blur(10px)}}
-.overlay-content{{text-align:center}}
-.spinner{{width:48px;height:48px;border:4px solid var(--surface3);border-top-color:var(--purple);border-radius:50%;animation:spin .8s linear infinite;margin:1.5rem auto 0}}
-@keyframes spin{{to{{transform:rotate(360deg)}}}}
-
-.result-icon{{font-size:3.5rem;margin-bottom:1rem}}
-.result-score{{font-family:'JetBrains Mono',monospace;font-size:2.5rem;font-weight:700;color:var(--purple);margin:.5rem 0}}
-
-.rules li{{padding:.4rem 0;color:var(--text2);font-size:.9375rem;display:flex;align-items:flex-start;gap:.5rem;list-style:none}}
-.rules li::before{{content:'•';color:var(--purple);font-weight:700;flex-shrink:0}}
-
-.hidden{{display:none!important}}
-@media(max-width:600px){{.card{{padding:1.5rem}}.q-text{{font-size:1.15rem}}}}
-</style>
+<link rel="stylesheet" href="{EXAM_CSS_URL}">
 </head>
 <body>
 
@@ -890,178 +1138,7 @@ body{{font-family:'Inter',sans-serif;background:var(--bg);color:var(--text);min-
   </div>
 </div>
 
-<script>
-const SLUG = "{slug}";
-const QUESTIONS = {questions_json};
-const DURATION_S = {duration} * 60;
-
-let answers = {{}};
-let currentQ = 0;
-let tabViolations = 0;
-let timerInterval = null;
-let secondsLeft = DURATION_S;
-let candidateName = '', candidateEmail = '', candidatePhone = '';
-
-// ── Info Form ──
-document.getElementById('infoForm').addEventListener('submit', e => {{
-  e.preventDefault();
-  candidateName  = document.getElementById('cName').value.trim();
-  candidateEmail = document.getElementById('cEmail').value.trim();
-  candidatePhone = document.getElementById('cPhone').value.trim();
-  startExam();
-}});
-
-function startExam() {{
-  showStep('step-exam');
-  buildNav();
-  renderQuestion(0);
-  startTimer();
-  document.addEventListener('visibilitychange', handleVisibility);
-  document.addEventListener('contextmenu', e => e.preventDefault());
-  document.addEventListener('copy', e => e.preventDefault());
-  document.addEventListener('paste', e => e.preventDefault());
-}}
-
-function startTimer() {{
-  timerInterval = setInterval(() => {{
-    secondsLeft--;
-    const m = Math.floor(secondsLeft / 60), s = secondsLeft % 60;
-    const el = document.getElementById('timer');
-    el.textContent = `${{m.toString().padStart(2,'0')}}:${{s.toString().padStart(2,'0')}}`;
-    if (secondsLeft <= 300) el.classList.add('warn');
-    if (secondsLeft <= 0) {{ clearInterval(timerInterval); submitExam('Time up!'); }}
-  }}, 1000);
-}}
-
-function buildNav() {{
-  const nav = document.getElementById('qNav');
-  nav.innerHTML = QUESTIONS.map((_, i) =>
-    `<button class="q-nav-btn${{i===0?' current':''}}" id="nb${{i}}" onclick="jumpTo(${{i}})">${{i+1}}</button>`
-  ).join('');
-}}
-
-function renderQuestion(idx) {{
-  const q = QUESTIONS[idx];
-  const total = QUESTIONS.length;
-  document.getElementById('progressLabel').textContent = `Question ${{idx+1}} of ${{total}}`;
-  const pct = Math.round(idx / total * 100);
-  document.getElementById('progressPct').textContent = pct + '%';
-  document.getElementById('progressFill').style.width = pct + '%';
-
-  document.querySelectorAll('.q-nav-btn').forEach((b,i) => {{
-    b.className = 'q-nav-btn' + (i===idx?' current':'') + (answers[QUESTIONS[i].id]!==undefined?' answered':'');
-  }});
-
-  const isMCQ = q.type === 'MCQ';
-  const badge = isMCQ ? '<span class="q-badge mcq">MCQ</span>' : '<span class="q-badge open">Open</span>';
-  const skill = q.skill ? `<span class="q-skill">${{esc(q.skill)}}</span>` : '';
-  let inputHtml = '';
-  if (isMCQ) {{
-    const letters = ['A','B','C','D'];
-    inputHtml = '<div class="options">' + q.options.map((opt, i) =>
-      `<div class="option${{answers[q.id]===letters[i]?' selected':''}}" onclick="selectMCQ(${{q.id}},'${{letters[i]}}',this)">
-        <div class="opt-letter">${{letters[i]}}</div>
-        <div class="opt-text">${{esc(opt)}}</div>
-      </div>`
-    ).join('') + '</div>';
-  }} else {{
-    const saved = answers[q.id] || '';
-    inputHtml = `<textarea class="text-answer" id="ta_${{q.id}}" placeholder="Type your answer here…" oninput="saveText(${{q.id}})">${{esc(saved)}}</textarea>`;
-  }}
-
-  const isLast = idx === QUESTIONS.length - 1;
-  document.getElementById('questionCard').innerHTML = `
-    <div class="q-meta">${{badge}}${{skill}}</div>
-    <div class="q-text">${{esc(q.question)}}</div>
-    ${{inputHtml}}
-  `;
-  document.getElementById('prevBtn').disabled = idx === 0;
-  document.getElementById('nextBtn').textContent = isLast ? '📤 Submit Exam' : 'Next →';
-  document.getElementById('nextBtn').className = 'btn ' + (isLast ? 'btn-submit' : 'btn-primary');
-  document.getElementById('nextBtn').onclick = isLast ? confirmSubmit : () => navigate(1);
-  currentQ = idx;
-}}
-
-function selectMCQ(qid, letter, el) {{
-  answers[qid] = letter;
-  el.closest('.options').querySelectorAll('.option').forEach(o => o.classList.remove('selected'));
-  el.classList.add('selected');
-  updateNav();
-}}
-
-function saveText(qid) {{
-  const val = document.getElementById('ta_' + qid)?.value || '';
-  if (val.trim()) answers[qid] = val;
-  else delete answers[qid];
-  updateNav();
-}}
-
-function updateNav() {{
-  QUESTIONS.forEach((q, i) => {{
-    const btn = document.getElementById('nb' + i);
-    if (btn) btn.className = 'q-nav-btn' + (i===currentQ?' current':'') + (answers[q.id]!==undefined?' answered':'');
-  }});
-}}
-
-function navigate(dir) {{
-  const next = currentQ + dir;
-  if (next >= 0 && next < QUESTIONS.length) renderQuestion(next);
-}}
-function jumpTo(idx) {{ renderQuestion(idx); }}
-
-function confirmSubmit() {{
-  const answered = Object.keys(answers).length;
-  const total = QUESTIONS.length;
-  if (answered < total && !confirm(`You've answered ${{answered}} of ${{total}} questions. Submit anyway?`)) return;
-  submitExam('Submitted by candidate');
-}}
-
-async function submitExam(reason) {{
-  clearInterval(timerInterval);
-  document.getElementById('overlay').classList.remove('hidden');
-  document.removeEventListener('visibilitychange', handleVisibility);
-
-  const payload = {{
-    name: candidateName, email: candidateEmail, phone: candidatePhone,
-    answers: answers, tab_violations: tabViolations,
-  }};
-  try {{
-    const res = await fetch(`/exam/${{SLUG}}/submit`, {{
-      method: 'POST',
-      headers: {{ 'Content-Type': 'application/json' }},
-      body: JSON.stringify(payload),
-    }});
-    const data = await res.json();
-    document.getElementById('overlay').classList.add('hidden');
-    document.getElementById('resultScore').textContent = data.mcq_score !== 'N/A' ? 'MCQ: ' + data.mcq_score : '✓';
-    showStep('step-result');
-  }} catch (e) {{
-    document.getElementById('overlay').classList.add('hidden');
-    alert('Submission failed. Please check your connection and try again.');
-  }}
-}}
-
-function handleVisibility() {{
-  if (document.hidden) {{
-    tabViolations++;
-    const el = document.getElementById('tabWarn');
-    document.getElementById('violationCount').textContent = `(${{tabViolations}}/3)`;
-    el.classList.add('show');
-    setTimeout(() => el.classList.remove('show'), 3500);
-    if (tabViolations >= 3) {{
-      el.textContent = '🚫 Too many tab switches — auto-submitting.';
-      el.classList.add('show');
-      setTimeout(() => submitExam('Auto-submit: tab violations'), 1200);
-    }}
-  }}
-}}
-
-function showStep(id) {{
-  document.querySelectorAll('.step').forEach(s => s.classList.remove('active'));
-  document.getElementById(id).classList.add('active');
-}}
-
-function esc(s) {{ const d = document.createElement('div'); d.textContent = s; return d.innerHTML; }}
-</script>
+<script>window.EXAM_CONFIG = JSON.parse('{config_js}');</script>
+<script src="{EXAM_JS_URL}"></script>
 </body>
 </html>"""